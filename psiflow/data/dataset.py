@@ -25,13 +25,13 @@ from .utils import (
     count_frames,
     extract_quantities,
     get_elements,
-    get_train_valid_indices,
     insert_quantities,
     join_frames,
     not_null,
     read_frames,
     reset_frames,
     shuffle,
+    split_frames,
     write_frames,
 )
 
@@ -61,6 +61,7 @@ class Dataset:
         Note:
             Either states or extxyz should be provided, not both.
         """
+        self._create_apps()
         if extxyz is not None:
             assert states is None
             self.extxyz = extxyz
@@ -77,6 +78,10 @@ class Dataset:
                 outputs=[psiflow.context().new_file("data_", ".xyz")],
             ).outputs[0]
 
+    def _create_apps(self):
+        # non-serialized state; also called by psiflow.deserialize
+        self._queries = {}  # app -> (extxyz, future) of read-only queries
+
     def length(self) -> AppFuture:
         """
         Get the number of structures in the dataset.
@@ -84,7 +89,15 @@ class Dataset:
         Returns:
             AppFuture: Future representing the number of structures.
         """
-        return count_frames(inputs=[self.extxyz])
+        return self._query(count_frames)
+
+    def _query(self, app: PythonApp) -> AppFuture:
+        # reuse futures of read-only queries until extxyz is reassigned
+        extxyz, future = self._queries.get(app, (None, None))
+        if extxyz is not self.extxyz:
+            future = app(inputs=[self.extxyz])
+            self._queries[app] = (self.extxyz, future)
+        return future
 
     def shuffle(self):
         """
@@ -143,14 +156,23 @@ class Dataset:
             outputs=[File(str(path))],
         )
 
-    def geometries(self) -> AppFuture:
+    def geometries(
+        self,
+        index: Union[None, slice, list[int], AppFuture] = None,
+    ) -> AppFuture:
         """
-        Get all geometries in the dataset.
+        Get all geometries in the dataset, or a subset of them.
+
+        Unlike `dataset[index].geometries()`, this does not write the subset
+        to a new file before reading it back.
+
+        Args:
+            index: Optional slice, list of integers, or AppFuture representing indices.
 
         Returns:
             AppFuture: Future representing a list of Geometry instances.
         """
-        return read_frames(inputs=[self.extxyz])
+        return read_frames(index, inputs=[self.extxyz])
 
     def __add__(self, dataset: Dataset) -> Dataset:
         """
@@ -213,7 +235,7 @@ class Dataset:
         Returns:
             AppFuture: Future representing a set of element symbols.
         """
-        return get_elements(inputs=[self.extxyz])
+        return self._query(get_elements)
 
     def reset(self):
         """
@@ -356,12 +378,17 @@ class Dataset:
         Returns:
             tuple[Dataset, Dataset]: Training and validation datasets.
         """
-        train, valid = get_train_valid_indices(
-            self.length(),
+        # single app instead of separate count, index, unpack and read tasks
+        future = split_frames(
             fraction,
             shuffle,
+            inputs=[self.extxyz],
+            outputs=[
+                psiflow.context().new_file("data_", ".xyz"),
+                psiflow.context().new_file("data_", ".xyz"),
+            ],
         )
-        return self.__getitem__(train), self.__getitem__(valid)
+        return Dataset(None, future.outputs[0]), Dataset(None, future.outputs[1])
 
     def assign_identifiers(
         self, identifier: Union[int, AppFuture, None] = None
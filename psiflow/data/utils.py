@@ -1,15 +1,16 @@
+import functools
+import itertools
+import os
 import re
 import shutil
 from typing import Optional, Union
 
 import numpy as np
 import typeguard
-from ase.data import atomic_numbers, chemical_symbols
+from ase.data import atomic_numbers
 from parsl.app.app import python_app
-from parsl.dataflow.futures import AppFuture
 
 from psiflow.geometry import Geometry, NullState, _assign_identifier, create_outputs
-from psiflow.utils.apps import unpack_i
 
 
 @typeguard.typechecked
@@ -52,6 +53,7 @@ def _read_frames(
     indices: Union[None, slice, list[int], int] = None,
     inputs: list = [],
     outputs: list = [],
+    parse_atoms: bool = True,
 ) -> Optional[list[Geometry]]:
     """
     Read Geometry instances from a file.
@@ -63,6 +65,8 @@ def _read_frames(
         outputs: List of Parsl futures. If provided, the first element should be
                  a DataFuture representing the output file path where the selected
                  geometries will be written.
+        parse_atoms: Whether to parse the atom lines of each frame. If False,
+                     only the comment lines are parsed.
 
     Returns:
         Optional[list[Geometry]]: List of read Geometry instances if no output
@@ -71,9 +75,25 @@ def _read_frames(
     Note:
         This function is wrapped as a Parsl app and executed using the default_threads executor.
     """
-    frame_index = 0
     frame_regex = re.compile(r"^\d+$")
-    length = _count_frames(inputs=inputs)
+    with open(inputs[0], "r") as f:
+        lines = f.readlines()
+
+    # single pass over the file to locate frames; only the requested frames
+    # are parsed or written
+    spans = []
+    i = 0
+    while i < len(lines):
+        line = lines[i].strip()
+        if frame_regex.match(line):
+            natoms = int(line)
+            assert i + natoms + 2 <= len(lines), "truncated frame at line {}".format(i)
+            spans.append((i, i + natoms + 2))
+            i += natoms + 2
+        else:
+            i += 1
+    length = len(spans)
+
     _all = range(length)
     if isinstance(indices, slice):
         indices = list(_all[indices])
@@ -83,37 +103,18 @@ def _read_frames(
     if isinstance(indices, list):
         if length > 0:
             indices = [i % length for i in indices]  # for negative indices and wrapping
-        indices_ = set(indices)  # for *much* faster 'i in indices'
+        spans = [spans[i] for i in indices]  # sort states accordingly
     else:
         assert indices is None
-        indices_ = None
-
-    data = []
-    with open(inputs[0], "r") as f:
-        while True:
-            line = f.readline()
-            if not line:
-                break
-            if frame_regex.match(line.strip()):
-                natoms = int(line.strip())
-
-                # currently at position frame_index, check if to be read
-                _ = [f.readline() for _i in range(natoms + 1)]
-                if indices_ is None or frame_index in indices_:
-                    data.append("".join([line] + _))
-                else:
-                    data.append(None)
-                frame_index += 1
-
-    if indices is not None:  # sort states accordingly
-        data = [data[i] for i in indices]
 
     if len(outputs) > 0:
         with open(outputs[0], "w") as f:
-            f.write("\n".join([d.strip() for d in data if d is not None]))
+            f.write("\n".join(["".join(lines[a:b]).strip() for a, b in spans]))
             f.write("\n")
-    else:
-        geometries = [Geometry.from_string(s) for s in data if s is not None]
+    else:  # parse atom lines directly, without joining them into a string first
+        geometries = [
+            Geometry._from_lines(lines[a + 1 : b], parse_atoms) for a, b in spans
+        ]
         return geometries
 
 
@@ -147,7 +148,9 @@ def _extract_quantities(
     """
     if not len(extra_data):
         assert len(inputs) == 1
-        data = _read_frames(inputs=inputs)
+        # frame-level quantities only require the comment lines
+        parse_atoms = bool({"positions", "forces", "numbers"} & set(quantities))
+        data = _read_frames(inputs=inputs, parse_atoms=parse_atoms)
     else:
         assert len(inputs) == 0
         data = list(extra_data)
@@ -156,26 +159,32 @@ def _extract_quantities(
     max_natoms = np.max(natoms)
 
     arrays = create_outputs(quantities, data)
+    if {"positions", "forces", "numbers"}.intersection(quantities):
+        # gather per-atom data of all frames at once and scatter it into the
+        # padded (nframes, max_natoms, ...) arrays with a single fancy index
+        per_atom = np.concatenate([geometry.per_atom for geometry in data])
+        frames = np.repeat(np.arange(len(data)), natoms)
+        atoms = np.arange(len(per_atom)) - np.repeat(np.cumsum(natoms) - natoms, natoms)
+        mask = get_index_element_mask(per_atom["numbers"], None, elements)
+        if atom_indices is not None:  # indices within the padded frame
+            selected = np.zeros(max_natoms, dtype=bool)
+            selected[np.array(atom_indices)] = True
+            mask &= selected[atoms]
+        for j, quantity in enumerate(quantities):
+            if quantity in ["positions", "forces"]:
+                arrays[j][frames[mask], atoms[mask]] = per_atom[quantity][mask]
+            elif quantity == "numbers":
+                arrays[j][frames, atoms] = per_atom["numbers"]
+
     for i, geometry in enumerate(data):
-        mask = get_index_element_mask(
-            geometry.per_atom.numbers,
-            atom_indices,
-            elements,
-            natoms_padded=int(max_natoms),
-        )
-        natoms = len(geometry)
         for j, quantity in enumerate(quantities):
-            if quantity == "positions":
-                arrays[j][i, mask, :] = geometry.per_atom.positions[mask[:natoms]]
-            elif quantity == "forces":
-                arrays[j][i, mask, :] = geometry.per_atom.forces[mask[:natoms]]
+            if quantity in ["positions", "forces", "numbers"]:
+                continue
             elif quantity == "cell":
                 arrays[j][i, :, :] = geometry.cell
             elif quantity == "stress":
                 if geometry.stress is not None:
                     arrays[j][i, :, :] = geometry.stress
-            elif quantity == "numbers":
-                arrays[j][i, :] = geometry.numbers
             elif quantity == "energy":
                 if geometry.energy is not None:
                     arrays[j][i] = geometry.energy
@@ -391,7 +400,7 @@ def _join_frames(
     with open(outputs[0], "wb") as destination:
         for input_file in inputs:
             with open(input_file, "rb") as source:
-                shutil.copyfileobj(source, destination)
+                shutil.copyfileobj(source, destination, length=1 << 20)
 
 
 join_frames = python_app(_join_frames, executors=["default_threads"])
@@ -412,15 +421,32 @@ def _count_frames(inputs: list = []) -> int:
     Note:
         This function is wrapped as a Parsl app and executed using the default_threads executor.
     """
+    return _summarize_frames(*_file_signature(inputs[0]))[0]
+
+
+def _file_signature(file) -> tuple[str, int, int]:
+    # identifies the contents of a file without reading it; data files are
+    # never modified in place, so (path, mtime, size) is sufficient
+    path = os.path.abspath(str(file))
+    stat = os.stat(path)
+    return path, stat.st_mtime_ns, stat.st_size
+
+
+@functools.lru_cache(maxsize=128)
+def _summarize_frames(path: str, mtime_ns: int, size: int) -> tuple[int, frozenset]:
+    # number of frames and element symbols in one pass, without parsing
+    # positions or the comment line
     nframes = 0
-    frame_regex = re.compile(r"^\d+$")
-    with open(inputs[0], "r") as f:
+    symbols = set()
+    with open(path, "rb") as f:
         for line in f:
-            if frame_regex.match(line.strip()):
+            line = line.strip()
+            if line.isdigit():
                 nframes += 1
-                natoms = int(line.strip())
-                _ = [f.readline() for _i in range(natoms + 1)]
-    return nframes
+                f.readline()  # comment
+                for atom_line in itertools.islice(f, int(line)):
+                    symbols.add(atom_line.split(None, 1)[0])
+    return nframes, frozenset([symbol.decode() for symbol in symbols])
 
 
 count_frames = python_app(_count_frames, executors=["default_threads"])
@@ -505,26 +531,16 @@ def _apply_offset(
     assert len(inputs) == 1
     assert len(outputs) == 1
     data = _read_frames(inputs=[inputs[0]])
-    numbers = [atomic_numbers[e] for e in atomic_energies.keys()]
-    all_numbers = [n for geometry in data for n in set(geometry.per_atom.numbers)]
-    for n in all_numbers:
-        if n != 0:  # from NullState
-            assert n in numbers
+    multiplier = -1 if subtract else 1
+    energy_per_number = np.full(np.iinfo(np.uint8).max + 1, np.nan)
+    for element, energy in atomic_energies.items():
+        energy_per_number[atomic_numbers[element]] = multiplier * energy
     for geometry in data:
         if geometry == NullState:
             continue
-        natoms = len(geometry)
-        energy = geometry.energy
-        for number in numbers:
-            natoms_per_number = np.sum(geometry.per_atom.numbers == number)
-            if natoms_per_number == 0:
-                continue
-            element = chemical_symbols[number]
-            multiplier = -1 if subtract else 1
-            energy += multiplier * natoms_per_number * atomic_energies[element]
-            natoms -= natoms_per_number
-        assert natoms == 0  # all atoms accounted for
-        geometry.energy = energy
+        offsets = energy_per_number[geometry.per_atom.numbers]
+        assert not np.any(np.isnan(offsets))  # all atoms accounted for
+        geometry.energy = geometry.energy + float(np.sum(offsets))
     _write_frames(*data, outputs=[outputs[0]])
 
 
@@ -546,8 +562,7 @@ def _get_elements(inputs: list = []) -> set[str]:
     Note:
         This function is wrapped as a Parsl app and executed using the default_threads executor.
     """
-    data = _read_frames(inputs=[inputs[0]])
-    return set([chemical_symbols[n] for g in data for n in g.per_atom.numbers])
+    return set(_summarize_frames(*_file_signature(inputs[0]))[1])
 
 
 get_elements = python_app(_get_elements, executors=["default_threads"])
@@ -597,26 +612,30 @@ def _not_null(inputs: list = [], outputs: list = []) -> list[bool]:
         This function is wrapped as a Parsl app and executed using the default_threads executor.
     """
     frame_regex = re.compile(r"^\d+$")
+    with open(inputs[0], "r") as f:
+        lines = f.readlines()
 
+    # only the atom line of single-atom frames needs to be inspected
     data = []
     mask = []
-    with open(inputs[0], "r") as f:
-        while True:
-            line = f.readline()
-            if not line:
-                break
-            if frame_regex.match(line.strip()):
-                natoms = int(line.strip())
-                _ = [f.readline() for _i in range(natoms + 1)]
-                if natoms == 1:
-                    if _[-1].strip()[0] == "X":  # check if element(-1) == X
-                        mask.append(False)
-                        continue
-                data.append("".join([line] + _))
+    i = 0
+    while i < len(lines):
+        line = lines[i].strip()
+        if frame_regex.match(line):
+            natoms = int(line)
+            stop = i + natoms + 2
+            assert stop <= len(lines), "truncated frame at line {}".format(i)
+            if natoms == 1 and lines[stop - 1].split(None, 1)[0] == "X":
+                mask.append(False)
+            else:
+                data.append("".join(lines[i:stop]))
                 mask.append(True)
+            i = stop
+        else:
+            i += 1
     if len(outputs) > 0:
         with open(outputs[0], "w") as f:
-            f.write("\n".join(data))
+            f.write("".join(data))
     return mask
 
 
@@ -646,29 +665,16 @@ def _app_filter(
         This function is wrapped as a Parsl app and executed using the default_threads executor.
     """
     data = _read_frames(inputs=[inputs[0]])
-    i = 0
-    while i < len(data):
+
+    def retain(geometry: Geometry) -> bool:
         if quantity == "forces":
-            if np.all(np.invert(np.isnan(data[i].per_atom.forces))):
-                retain = True
-            else:
-                retain = False
+            return bool(np.all(np.invert(np.isnan(geometry.per_atom.forces))))
         elif quantity == "cell":
-            if not np.allclose(data[i].cell, 0.0):
-                retain = True
-            else:
-                retain = False
-        elif hasattr(data[i], quantity) and getattr(data[i], quantity) is not None:
-            retain = True
+            return not np.allclose(geometry.cell, 0.0)
         else:
-            retain = False
-
-        # pop if necessary:
-        if retain:
-            i += 1
-        else:
-            data.pop(i)
+            return getattr(geometry, quantity, None) is not None
 
+    data = [geometry for geometry in data if retain(geometry)]
     _write_frames(*data, outputs=[outputs[0]])
 
 
@@ -724,9 +730,6 @@ def _train_valid_indices(
 
     Returns:
         tuple[list[int], list[int]]: Lists of indices for training and validation sets.
-
-    Note:
-        This function is wrapped as a Parsl app and executed using the default_threads executor.
     """
     ntrain = int(np.floor(effective_nstates * train_valid_split))
     nvalid = effective_nstates - ntrain
@@ -735,33 +738,48 @@ def _train_valid_indices(
     order = np.arange(ntrain + nvalid, dtype=int)
     if shuffle:
         np.random.shuffle(order)
-    train_list = list(order[:ntrain])
-    valid_list = list(order[ntrain : (ntrain + nvalid)])
-    return [int(i) for i in train_list], [int(i) for i in valid_list]
-
-
-train_valid_indices = python_app(_train_valid_indices, executors=["default_threads"])
+    return order[:ntrain].tolist(), order[ntrain:].tolist()  # python ints
 
 
 @typeguard.typechecked
-def get_train_valid_indices(
-    effective_nstates: AppFuture,
+def _split_frames(
     train_valid_split: float,
     shuffle: bool,
-) -> tuple[AppFuture, AppFuture]:
+    inputs: list = [],
+    outputs: list = [],
+) -> None:
     """
-    Get futures for train and validation indices.
+    Split the frames in a file into a training and validation file.
 
     Args:
-        effective_nstates: Future representing the total number of states.
         train_valid_split: Fraction of states to use for training.
         shuffle: Whether to shuffle the indices.
+        inputs: List of Parsl futures. The first element should be a DataFuture
+                representing the input file path containing geometry data.
+        outputs: List of Parsl futures. The first and second element should be
+                 DataFutures representing the output file paths of the training
+                 and validation frames, respectively.
 
     Returns:
-        tuple[AppFuture, AppFuture]: Futures for training and validation indices.
+        None
+
+    Note:
+        This function is wrapped as a Parsl app and executed using the default_threads executor.
     """
-    future = train_valid_indices(effective_nstates, train_valid_split, shuffle)
-    return unpack_i(future, 0), unpack_i(future, 1)
+    nstates = _count_frames(inputs=[inputs[0]])
+    train, valid = _train_valid_indices(nstates, train_valid_split, shuffle)
+    _read_frames(train, inputs=[inputs[0]], outputs=[outputs[0]])
+    _read_frames(valid, inputs=[inputs[0]], outputs=[outputs[1]])
+
+
+split_frames = python_app(_split_frames, executors=["default_threads"])
+
+
+@functools.lru_cache(maxsize=None)
+def _elements_to_numbers(elements: tuple[str, ...]) -> np.ndarray:
+    numbers = np.array([atomic_numbers[e] for e in elements], dtype=np.int64)
+    numbers.flags.writeable = False  # shared between calls
+    return numbers
 
 
 @typeguard.typechecked
@@ -783,24 +801,21 @@ def get_index_element_mask(
     Returns:
         np.ndarray: Boolean mask array.
     """
-    mask = np.array([True] * len(numbers))
+    mask = np.ones(len(numbers), dtype=bool)
 
     if elements is not None:
-        numbers_to_include = [atomic_numbers[e] for e in elements]
-        mask_elements = np.array([False] * len(numbers))
-        for number in numbers_to_include:
-            mask_elements = np.logical_or(mask_elements, (numbers == number))
-        mask = np.logical_and(mask, mask_elements)
+        numbers_to_include = _elements_to_numbers(tuple(elements))
+        mask &= np.isin(numbers, numbers_to_include)
 
     if natoms_padded is not None:
         assert natoms_padded >= len(numbers)
         padding = natoms_padded - len(numbers)
-        mask = np.concatenate((mask, np.array([False] * padding)), axis=0).astype(bool)
+        mask = np.concatenate((mask, np.zeros(padding, dtype=bool)))
 
     if atom_indices is not None:  # below padding
-        mask_indices = np.array([False] * len(mask))
+        mask_indices = np.zeros(len(mask), dtype=bool)
         mask_indices[np.array(atom_indices)] = True
-        mask = np.logical_and(mask, mask_indices)
+        mask &= mask_indices
 
     return mask
 
@@ -828,7 +843,8 @@ def _compute_rmse(
     assert array0.shape == array1.shape
     assert np.all(np.isnan(array0) == np.isnan(array1))
 
-    se = (array0 - array1) ** 2
+    se = np.subtract(array0, array1, dtype=np.float64)
+    np.square(se, out=se)  # in place, no second temporary
     se = se.reshape(se.shape[0], -1)
 
     if reduce:  # across both dimensions
@@ -838,14 +854,12 @@ def _compute_rmse(
         if se.ndim == 1:
             return se
         else:
-            values = np.empty(len(se))
-            for i in range(len(se)):
-                if np.all(np.isnan(se[i])):
-                    values[i] = np.nan
-                else:
-                    mask = np.logical_not(np.isnan(se[i]))
-                    value = np.sqrt(np.mean(se[i][mask]))
-                    values[i] = value
+            mask = np.logical_not(np.isnan(se))
+            counts = np.count_nonzero(mask, axis=1)
+            sums = np.sum(se, axis=1, where=mask)
+            values = np.full(len(se), np.nan)
+            valid = counts > 0
+            values[valid] = np.sqrt(sums[valid] / counts[valid])
             return values
 
 
@@ -876,7 +890,8 @@ def _compute_mae(
     mask0 = np.logical_not(np.isnan(array0))
     mask1 = np.logical_not(np.isnan(array1))
     assert np.all(mask0 == mask1)
-    ae = np.abs(array0 - array1)
+    ae = np.subtract(array0, array1, dtype=np.float64)
+    np.abs(ae, out=ae)
     to_reduce = tuple(range(1, array0.ndim))
     mask = np.logical_not(np.all(np.isnan(ae), axis=to_reduce))
     ae = ae[mask0].reshape(np.sum(1 * mask), -1)
@@ -171,6 +171,7 @@ class ModelEvaluation(ExecutionDefinition):
         max_simulation_time: Optional[float] = None,
         timeout: float = (10 / 60),  # 5 seconds
         env_vars: Optional[dict[str, str]] = None,
+        torch_compile: bool = False,
         **kwargs,
     ) -> None:
         super().__init__(**kwargs)
@@ -178,6 +179,7 @@ class ModelEvaluation(ExecutionDefinition):
             assert max_simulation_time * 60 < self.max_runtime
         self.max_simulation_time = max_simulation_time
         self.timeout = timeout
+        self.torch_compile = torch_compile
 
         default_env_vars = {
             "OMP_NUM_THREADS": str(self.cores_per_worker),
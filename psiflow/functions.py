@@ -1,3 +1,4 @@
+import functools
 import json
 import os
 import tempfile
@@ -7,7 +8,6 @@ from typing import ClassVar, Optional, Type, Union, get_type_hints
 
 import numpy as np
 import typeguard
-from ase import Atoms
 from ase.data import atomic_masses, chemical_symbols
 from ase.units import fs, kJ, mol, nm
 
@@ -56,10 +56,9 @@ class EinsteinCrystalFunction(EnergyFunction):
             grad_pos[i, : len(geometry)] = (-1.0) * self.force_constant * delta
             if geometry.periodic and self.volume > 0.0:
                 delta = np.linalg.det(geometry.cell) - self.volume
-                _stress = self.force_constant * np.eye(3) * delta
+                grad_cell[i, :] = self.force_constant * np.eye(3) * delta
             else:
-                _stress = np.zeros((3, 3))
-            grad_cell[i, :] = _stress
+                grad_cell[i, :] = 0.0  # fill in place; no temporary zeros
 
         return {"energy": value, "forces": grad_pos, "stress": grad_cell}
 
@@ -72,6 +71,7 @@ class PlumedFunction(EnergyFunction):
 
     def __post_init__(self):
         self.plumed_instances = {}
+        self.plumed_buffers = {}
 
     def __call__(
         self,
@@ -86,18 +86,20 @@ class PlumedFunction(EnergyFunction):
         if self.external is not None:
             assert self.external in plumed_input
 
-        def geometry_to_key(geometry: Geometry) -> tuple:
-            return tuple([geometry.periodic]) + tuple(geometry.per_atom.numbers)
-
         for i, geometry in enumerate(geometries):
             if geometry == NullState:
                 continue
-            key = geometry_to_key(geometry)
+            # raw bytes hash much faster than a tuple of numpy scalars
+            key = (geometry.periodic, geometry.per_atom.numbers.tobytes())
             if key not in self.plumed_instances:
                 from plumed import Plumed
 
+                # keep plumed logs in memory-backed storage when possible
                 tmp = tempfile.NamedTemporaryFile(
-                    prefix="plumed_", mode="w+", delete=False
+                    prefix="plumed_",
+                    mode="w+",
+                    delete=False,
+                    dir="/dev/shm" if os.path.isdir("/dev/shm") else None,
                 )
                 # plumed creates a back up if this file would already exist
                 os.remove(tmp.name)
@@ -121,32 +123,40 @@ class PlumedFunction(EnergyFunction):
                 self.plumed_instances[key] = plumed_
 
             plumed_ = self.plumed_instances[key]
+            if key not in self.plumed_buffers:
+                self.plumed_buffers[key] = (
+                    np.zeros((1,)),
+                    np.empty((len(geometry), 3)),
+                    np.empty((len(geometry), 3)),
+                    np.empty((3, 3)),
+                    np.empty((3, 3)),
+                    np.array([atomic_masses[n] for n in geometry.per_atom.numbers]),
+                )
+            energy, positions, forces, cell, virial, masses = self.plumed_buffers[key]
+            cmd = plumed_.cmd
             if geometry.periodic:
-                cell = np.copy(geometry.cell).astype(np.float64).copy()
-                plumed_.cmd("setBox", cell)
-
-            # set positions
-            energy = np.zeros((1,))
-            forces = np.zeros((len(geometry), 3))
-            virial = np.zeros((3, 3))
-            masses = np.array([atomic_masses[n] for n in geometry.per_atom.numbers])
-            plumed_.cmd("setStep", 0)
-            copied_positions = geometry.per_atom.positions.astype(np.float64).copy()
-            plumed_.cmd("setPositions", copied_positions)
-            plumed_.cmd("setMasses", masses)
-            plumed_.cmd("setForces", forces)
-            plumed_.cmd("setVirial", virial)
-            plumed_.cmd("prepareCalc")
-            plumed_.cmd("performCalcNoUpdate")
-            plumed_.cmd("getBias", energy)
-            if geometry.periodic:
-                stress = virial / np.linalg.det(geometry.cell)
-            else:
-                stress = np.zeros((3, 3))
-
+                np.copyto(cell, geometry.cell)
+                cmd("setBox", cell)
+
+            # set positions; plumed accumulates into forces and virial
+            energy.fill(0.0)
+            forces.fill(0.0)
+            virial.fill(0.0)
+            np.copyto(positions, geometry.per_atom.positions)
+            cmd("setStep", 0)
+            cmd("setPositions", positions)
+            cmd("setMasses", masses)
+            cmd("setForces", forces)
+            cmd("setVirial", virial)
+            cmd("prepareCalc")
+            cmd("performCalcNoUpdate")
+            cmd("getBias", energy)
             value[i] = float(energy.item())
             grad_pos[i, : len(geometry)] = forces
-            grad_cell[i] = stress
+            if geometry.periodic:
+                np.divide(virial, np.linalg.det(geometry.cell), out=grad_cell[i])
+            else:
+                grad_cell[i] = 0.0  # fill in place; no temporary zeros
         return {"energy": value, "forces": grad_pos, "stress": grad_cell}
 
 
@@ -196,6 +206,52 @@ class HarmonicFunction(EnergyFunction):
         return {"energy": energy, "forces": forces, "stress": stress}
 
 
+def set_torch_defaults(dtype: str, ncores: Optional[int] = None) -> None:
+    # changing either of these resets global torch state; only do so if needed
+    import torch
+
+    if torch.get_default_dtype() != getattr(torch, dtype):
+        torch.set_default_dtype(getattr(torch, dtype))
+    if ncores is not None and torch.get_num_threads() != ncores:
+        torch.set_num_threads(ncores)
+
+
+@functools.lru_cache(maxsize=4)
+def load_mace_model(
+    model_path: str,
+    mtime: float,
+    device,
+    dtype: str,
+    torch_compile: bool = False,
+):
+    # workers persist across tasks; cache on mtime to pick up overwritten files
+    import torch
+
+    try:  # deployed (TorchScript) models load without unpickling python objects
+        model = torch.jit.load(model_path, map_location="cpu")
+    except RuntimeError:
+        model = torch.load(f=model_path, map_location="cpu")
+    if device.type == "cuda" and not isinstance(model, torch.jit.ScriptModule):
+        try:  # use fused cuEquivariance kernels if available
+            import cuequivariance  # noqa: F401
+            from mace.cli.convert_e3nn_cueq import run as convert_e3nn_cueq
+
+            model = convert_e3nn_cueq(model, device="cpu", return_model=True)
+        except ImportError:
+            pass
+    if dtype == "float64":
+        model = model.double()
+    else:
+        model = model.float()
+    model = model.to(device)
+    model.eval()
+    if torch_compile and device.type == "cuda":
+        # fuse the many small e3nn kernels; attributes remain accessible.
+        # no CUDA graphs: the number of atoms and edges varies between calls
+        model = torch.compile(model, dynamic=True, fullgraph=False)
+    return model
+
+
 @typeguard.typechecked
 @dataclass
 class MACEFunction(EnergyFunction):
@@ -205,6 +261,9 @@ class MACEFunction(EnergyFunction):
     dtype: str
     atomic_energies: dict[str, float]
     env_vars: Optional[dict[str, str]] = None
+    batch_size: int = 16
+    torch_compile: bool = False
+    compute_stress: bool = True
 
     def __post_init__(self):
         import logging
@@ -215,23 +274,20 @@ class MACEFunction(EnergyFunction):
             for key, value in self.env_vars.items():
                 os.environ[key] = value
 
-        import torch
         from mace.tools import torch_tools, utils
 
-        torch_tools.set_default_dtype(self.dtype)
+        set_torch_defaults(self.dtype, self.ncores)
         if self.device == "gpu":  # when it's not a specific GPU, use any
             self.device = "cuda"
         self.device = torch_tools.init_device(self.device)
 
-        torch.set_num_threads(self.ncores)
-        model = torch.load(f=self.model_path, map_location="cpu")
-        if self.dtype == "float64":
-            model = model.double()
-        else:
-            model = model.float()
-        model = model.to(self.device)
-        model.eval()
-        self.model = model
+        self.model = load_mace_model(
+            self.model_path,
+            os.path.getmtime(self.model_path),
+            self.device,
+            self.dtype,
+            self.torch_compile,
+        )
         self.r_max = float(self.model.r_max)
         self.z_table = utils.AtomicNumberTable(
             [int(z) for z in self.model.atomic_numbers]
@@ -255,12 +311,15 @@ class MACEFunction(EnergyFunction):
 
     def __call__(self, geometries: list[Geometry]) -> dict[str, np.ndarray]:
         from mace import data
-        from mace.tools import torch_geometric, torch_tools
+        from mace.tools import torch_geometric
 
-        torch_tools.set_default_dtype(self.dtype)
+        set_torch_defaults(self.dtype)
 
         energy, forces, stress = create_outputs(self.outputs, geometries)
 
+        # periodic and nonperiodic geometries are batched separately because
+        # stress can only be computed for the former
+        indices_per_periodicity = {True: [], False: []}
         for i, geometry in enumerate(geometries):
             if geometry == NullState:
                 continue
@@ -270,36 +329,60 @@ class MACEFunction(EnergyFunction):
                 energy[i] = self.get_atomic_energy(geometry)
             else:
                 energy[i] = 0.0
+            indices_per_periodicity[geometry.periodic].append(i)
 
-            cell = None
-            if geometry.periodic:
-                cell = np.copy(geometry.cell)
-            atoms = Atoms(
-                positions=geometry.per_atom.positions,
-                numbers=geometry.per_atom.numbers,
-                cell=cell,
-                pbc=geometry.periodic,
-            )
-            config = data.config_from_atoms(atoms)
-            data_loader = torch_geometric.dataloader.DataLoader(
-                dataset=[
+        for periodic, indices in indices_per_periodicity.items():
+            if len(indices) == 0:
+                continue
+            # group similarly sized graphs to limit imbalance within batches
+            indices = sorted(indices, key=lambda i: len(geometries[i]))
+            atomic_data = []
+            for i in indices:
+                geometry = geometries[i]
+                # build configuration directly; avoids ase.Atoms construction
+                config = data.Configuration(
+                    atomic_numbers=geometry.per_atom.numbers.astype(int),
+                    positions=np.ascontiguousarray(geometry.per_atom.positions),
+                    cell=np.copy(geometry.cell),
+                    pbc=(periodic,) * 3,
+                )
+                atomic_data.append(
                     data.AtomicData.from_config(
                         config, z_table=self.z_table, cutoff=self.r_max
                     )
-                ],
-                batch_size=1,
+                )
+            data_loader = torch_geometric.dataloader.DataLoader(
+                dataset=atomic_data,
+                batch_size=self.batch_size,
                 shuffle=False,
                 drop_last=False,
             )
-            batch = next(iter(data_loader)).to(device=self.device)
-
-            compute_stress = cell is not None
-            out = self.model(batch.to_dict(), compute_stress=compute_stress)
+            compute_stress = periodic and self.compute_stress
+            count = 0
+            for batch in data_loader:
+                batch = batch.to(device=self.device)
+                # energy, forces and stress from one forward and a single
+                # backward pass w.r.t. positions and strain (no graph retained)
+                out = self.model(
+                    batch.to_dict(),
+                    training=False,
+                    compute_force=True,
+                    compute_virials=False,
+                    compute_stress=compute_stress,
+                )
 
-            energy[i] += out["energy"].detach().cpu().item()
-            forces[i, : len(geometry)] = out["forces"].detach().cpu().numpy()
-            if cell is not None:
-                stress[i, :] = out["stress"].detach().cpu().numpy()
+                ptr = batch.ptr.detach().cpu().numpy()
+                energy_ = out["energy"].detach().cpu().numpy()
+                forces_ = out["forces"].detach().cpu().numpy()
+                if compute_stress:
+                    stress_ = out["stress"].detach().cpu().numpy()
+                for j in range(len(ptr) - 1):
+                    i = indices[count + j]
+                    energy[i] += energy_[j]
+                    forces[i, : len(geometries[i])] = forces_[ptr[j] : ptr[j + 1]]
+                    if compute_stress:
+                        stress[i, :] = stress_[j]
+                count += len(ptr) - 1
         return {"energy": energy, "forces": forces, "stress": stress}
 
 
@@ -333,6 +416,8 @@ def _apply(
         states = [arg]
     else:
         states = arg
+    if "stress" not in outputs_ and "compute_stress" in get_type_hints(function_cls):
+        parameters["compute_stress"] = False  # skip backward pass w.r.t. strain
     function = function_cls(**parameters)
     output_dict = function(states)
     output_arrays = sort_outputs(outputs_, **output_dict)
@@ -1,5 +1,8 @@
 from __future__ import annotations  # necessary for type-guarding class methods
 
+import functools
+import math
+import re
 from pathlib import Path
 from typing import Optional, Union
 
@@ -20,6 +23,25 @@ per_atom_dtype = np.dtype(
     ]
 )
 
+SYMBOLS = np.array(chemical_symbols)
+NUMBERS = {symbol: number for number, symbol in enumerate(chemical_symbols)}
+
+# key="quoted value" or key=value, same token rules as ASE's extxyz comment regexes
+KEY_VALUE_REGEX = re.compile(
+    r'\s*(?:([A-Za-z_][A-Za-z0-9_-]*)\s*=\s*"([^"{}]+)"'
+    r"|([A-Za-z_][A-Za-z0-9_]*)\s*=\s*([^\s\"{}]+))\s*"
+)
+COMMENT_KEYS = {
+    "Lattice",
+    "energy",
+    "stress",
+    "delta",
+    "phase",
+    "logprob",
+    "stdout",
+    "identifier",
+}
+
 QUANTITIES = [
     "positions",
     "cell",
@@ -142,13 +164,15 @@ class Geometry:
         """
         if not isinstance(other, Geometry):
             return False
+        if other is self:
+            return True
         # have to check separately for np.allclose due to different dtypes
         equal = True
         equal = equal and (len(self) == len(other))
         equal = equal and (self.periodic == other.periodic)
         if not equal:
             return False
-        equal = equal and np.allclose(self.per_atom.numbers, other.per_atom.numbers)
+        equal = equal and np.array_equal(self.per_atom.numbers, other.per_atom.numbers)
         equal = equal and np.allclose(self.per_atom.positions, other.per_atom.positions)
         equal = equal and np.allclose(self.cell, other.cell)
         return bool(equal)
@@ -218,12 +242,16 @@ class Geometry:
         fmt = " ".join(["%2s"] + 3 * ["%16.8f"]) + " "
         if write_forces:
             fmt += " ".join(3 * ["%16.8f"])
-        for i in range(len(self)):
-            entry = (chemical_symbols[self.per_atom.numbers[i]],)
-            entry = entry + tuple(self.per_atom.positions[i])
+
+        # format all atoms with a single % operation on a flattened table
+        if len(self) > 0:
+            table = np.empty((len(self), 7 if write_forces else 4), dtype=object)
+            table[:, 0] = SYMBOLS[self.per_atom.numbers]
+            table[:, 1:4] = self.per_atom.positions
             if write_forces:
-                entry = entry + tuple(self.per_atom.forces[i])
-            lines.append(fmt % entry)
+                table[:, 4:7] = self.per_atom.forces
+            atom_lines = "\n".join(len(self) * [fmt]) % tuple(table.ravel().tolist())
+            lines.append(atom_lines)
         return "\n".join(lines)
 
     def save(self, path_xyz: Union[Path, str]):
@@ -244,7 +272,42 @@ class Geometry:
         Returns:
             Geometry: A new Geometry instance with the same data.
         """
-        return Geometry.from_string(self.to_string())
+        return Geometry(
+            per_atom=self.per_atom,  # copied in __init__
+            cell=self.cell,
+            order=dict(self.order),
+            energy=self.energy,
+            stress=None if self.stress is None else self.stress.copy(),
+            delta=self.delta,
+            phase=self.phase,
+            logprob=None if self.logprob is None else self.logprob.copy(),
+            stdout=self.stdout,
+            identifier=self.identifier,
+        )
+
+    def __deepcopy__(self, memodict: dict) -> Geometry:
+        return self.copy()  # avoids generic traversal of the recarray
+
+    @classmethod
+    def _from_arrays(
+        cls, per_atom: np.recarray, cell: np.ndarray, **kwargs
+    ) -> Geometry:
+        """
+        Create a Geometry instance which takes ownership of a freshly allocated
+        per_atom array of the right dtype, skipping the copy made in `__init__`.
+
+        Args:
+            per_atom (np.recarray): Record array with dtype `per_atom_dtype`.
+            cell (np.ndarray): 3x3 array representing the unit cell vectors.
+            **kwargs: Remaining arguments of `__init__`.
+
+        Returns:
+            Geometry: A new Geometry instance.
+        """
+        assert per_atom.dtype == per_atom_dtype
+        geometry = cls(per_atom[:0], cell, **kwargs)
+        geometry.per_atom = per_atom
+        return geometry
 
     @classmethod
     def from_string(cls, s: str, natoms: Optional[int] = None) -> Optional[Geometry]:
@@ -269,8 +332,24 @@ class Geometry:
                 "\n"
             )  # i-PI nonperiodic starts with empty -> rstrip!
         assert len(lines) == natoms + 1
-        comment = lines[0]
-        comment_dict = key_val_str_to_dict_regex(comment)
+        return cls._from_lines(lines)
+
+    @classmethod
+    def _from_lines(cls, lines: list[str], parse_atoms: bool = True) -> Geometry:
+        """
+        Create a Geometry instance from the comment line and atom lines of a frame.
+
+        Args:
+            lines (list[str]): Comment line followed by one line per atom.
+            parse_atoms (bool): If False, only the comment line is parsed and
+                numbers, positions and forces are left empty.
+
+        Returns:
+            Geometry: A new Geometry instance.
+        """
+        natoms = len(lines) - 1
+        comment = lines[0].rstrip("\n")
+        comment_dict = _parse_comment(comment)
 
         # read and format per_atom data
         column_indices = {}
@@ -286,25 +365,32 @@ class Geometry:
 
         per_atom = np.recarray(natoms, dtype=per_atom_dtype)
         per_atom.forces[:] = np.nan
-        POS_INDEX = column_indices.get("pos", 1)
-        FORCES_INDEX = column_indices.get("forces", None)
-        for i in range(natoms):
-            values = lines[i + 1].split()
-            per_atom.numbers[i] = chemical_symbols.index(values[0])
-            per_atom.positions[i, :] = [
-                float(_) for _ in values[POS_INDEX : POS_INDEX + 3]
-            ]
+        if natoms == 0:  # nothing to parse; loadtxt cannot handle empty input
+            pass
+        elif not parse_atoms:  # header only, e.g. when extracting energies
+            per_atom.numbers[:] = 0
+            per_atom.positions[:] = np.nan
+        else:
+            POS_INDEX = column_indices.get("pos", 1)
+            FORCES_INDEX = column_indices.get("forces", None)
+            # symbols are split off per line, all numeric columns parsed at once
+            symbols = [line.split(None, 1)[0] for line in lines[1:]]
+            per_atom.numbers[:] = [NUMBERS[s] for s in symbols]
+            columns = [POS_INDEX + j for j in range(3)]
+            if FORCES_INDEX is not None:
+                columns += [FORCES_INDEX + j for j in range(3)]
+            values = np.loadtxt(lines[1:], usecols=columns, ndmin=2)
+            values = values.reshape(natoms, -1)
+            per_atom.positions[:] = values[:, :3]
             if FORCES_INDEX is not None:
-                per_atom.forces[i, :] = [
-                    float(_) for _ in values[FORCES_INDEX : FORCES_INDEX + 3]
-                ]
+                per_atom.forces[:] = values[:, 3:]
 
         order = {}
         for key, value in comment_dict.items():
             if key.startswith("order_"):
                 order[key.replace("order_", "")] = value
 
-        geometry = cls(
+        geometry = cls._from_arrays(
             per_atom=per_atom,
             cell=comment_dict.pop("Lattice", np.zeros((3, 3))).T,  # transposed!
             energy=comment_dict.pop("energy", None),
@@ -343,7 +429,8 @@ class Geometry:
         Returns:
             bool: True if the geometry is periodic, False otherwise.
         """
-        return np.any(self.cell)
+        # not cached: cell is routinely modified in place (e.g. cell[:] = 0.0)
+        return bool(self.cell.any())
 
     @property
     def per_atom_energy(self):
@@ -393,11 +480,9 @@ class Geometry:
         per_atom.numbers[:] = numbers
         per_atom.positions[:] = positions
         per_atom.forces[:] = np.nan
-        if cell is not None:
-            cell = cell.copy()
-        else:
+        if cell is None:
             cell = np.zeros((3, 3))
-        return Geometry(per_atom, cell)
+        return cls._from_arrays(per_atom, cell)  # cell is copied in __init__
 
     @classmethod
     def from_atoms(cls, atoms: Atoms) -> Geometry:
@@ -418,7 +503,7 @@ class Geometry:
             cell = np.array(atoms.cell)
         else:
             cell = np.zeros((3, 3))
-        geometry = cls(per_atom, cell)
+        geometry = cls._from_arrays(per_atom, cell)
         geometry.energy = atoms.info.get("energy", None)
         geometry.stress = atoms.info.get("stress", None)
         geometry.delta = atoms.info.get("delta", None)
@@ -429,6 +514,54 @@ class Geometry:
         return geometry
 
 
+def _parse_comment(comment: str) -> dict:
+    """
+    Parse the key-value pairs in an extended XYZ comment line.
+
+    Only the keys which are read by `Geometry.from_string` are kept; their values
+    are converted exactly as in ASE's `key_val_str_to_dict_regex`, which remains
+    the fallback for comments that are not a plain sequence of key-value pairs.
+
+    Args:
+        comment (str): Comment line of an extended XYZ frame.
+
+    Returns:
+        dict: Parsed values per key.
+    """
+    comment_dict = {}
+    position = 0
+    while position < len(comment):
+        match = KEY_VALUE_REGEX.match(comment, position)
+        if match is None:
+            return key_val_str_to_dict_regex(comment)
+        position = match.end()
+        quoted_key, quoted_value, key, value = match.groups()
+        if quoted_key:
+            key, value = quoted_key, quoted_value
+        if key == "Properties":
+            comment_dict[key] = value
+        elif key in COMMENT_KEYS or key.startswith("order_"):
+            comment_dict[key] = _parse_value(value)
+    return comment_dict
+
+
+def _parse_value(value: str):
+    words = value.split()
+    if words and all(word in ("T", "F") for word in words):
+        if len(words) > 1:
+            return [word == "T" for word in words]
+        return {"T": True, "F": False}.get(value, value)  # unless padded
+    try:
+        numbers = [float(x) if "." in x else int(float(x)) for x in words]
+    except (ValueError, OverflowError):
+        return value
+    if len(numbers) == 1:
+        return numbers[0]
+    elif len(numbers) == 9:  # 3x3 matrix, fortran ordering
+        return np.array(numbers).reshape((3, 3), order="F")
+    return np.array(numbers)
+
+
 def new_nullstate():
     """
     Create a new null state Geometry.
@@ -501,23 +634,40 @@ def transform_lower_triangular(
     if reorder:  # reorder box vectors as k, l, m with |k| >= |l| >= |m|
         norms = np.linalg.norm(cell, axis=1)
         ordering = np.argsort(norms)[::-1]  # largest first
-        a = cell[ordering[0], :].copy()
-        b = cell[ordering[1], :].copy()
-        c = cell[ordering[2], :].copy()
-        cell[0, :] = a[:]
-        cell[1, :] = b[:]
-        cell[2, :] = c[:]
-    q, r = np.linalg.qr(cell.T)
-    flip_vectors = np.eye(3) * np.diag(np.sign(r))  # reflections after rotation
-    rotation = np.linalg.inv(q.T) @ flip_vectors  # full (improper) rotation
+        cell[:] = cell[ordering]
+    # equivalent to Q of the QR decomposition of cell.T with a positive diagonal
+    # in R, i.e. a full (improper) rotation; written out since LAPACK overhead
+    # dominates for a 3x3 matrix
+    rotation = _gram_schmidt(cell)
     pos[:] = pos @ rotation
     cell[:] = cell @ rotation
-    assert np.allclose(cell, np.linalg.cholesky(cell @ cell.T), atol=1e-5)
+    # lower triangular with positive diagonal, i.e. its own Cholesky factor
+    assert np.all(np.abs(cell[np.triu_indices(3, k=1)]) < 1e-5)
+    assert np.all(np.diag(cell) > 0)
     cell[0, 1] = 0
     cell[0, 2] = 0
     cell[1, 2] = 0
 
 
+def _gram_schmidt(cell: np.ndarray) -> np.ndarray:
+    (ax, ay, az), (bx, by, bz), (cx, cy, cz) = cell.tolist()
+    norm = math.sqrt(ax * ax + ay * ay + az * az)
+    ax, ay, az = ax / norm, ay / norm, az / norm
+
+    proj = bx * ax + by * ay + bz * az
+    bx, by, bz = bx - proj * ax, by - proj * ay, bz - proj * az
+    norm = math.sqrt(bx * bx + by * by + bz * bz)
+    bx, by, bz = bx / norm, by / norm, bz / norm
+
+    proj = cx * ax + cy * ay + cz * az
+    cx, cy, cz = cx - proj * ax, cy - proj * ay, cz - proj * az
+    proj = cx * bx + cy * by + cz * bz
+    cx, cy, cz = cx - proj * bx, cy - proj * by, cz - proj * bz
+    norm = math.sqrt(cx * cx + cy * cy + cz * cz)
+    cx, cy, cz = cx / norm, cy / norm, cz / norm
+    return np.array([[ax, bx, cx], [ay, by, cy], [az, bz, cz]])
+
+
 def reduce_box_vectors(cell: np.ndarray):
     """Uses linear combinations of box vectors to obtain the reduced form
 
@@ -532,9 +682,10 @@ def reduce_box_vectors(cell: np.ndarray):
     # b_y > |2 c_y|
     # b_x > |2 c_x|
     # a_x > |2 b_x|
-    cell[2, :] = cell[2, :] - cell[1, :] * np.round(cell[2, 1] / cell[1, 1])
-    cell[2, :] = cell[2, :] - cell[0, :] * np.round(cell[2, 0] / cell[0, 0])
-    cell[1, :] = cell[1, :] - cell[0, :] * np.round(cell[1, 0] / cell[0, 0])
+    # scalar rounding (half to even, as np.round) avoids array dispatch
+    cell[2, :] -= cell[1, :] * round(cell[2, 1] / cell[1, 1])
+    cell[2, :] -= cell[0, :] * round(cell[2, 0] / cell[0, 0])
+    cell[1, :] -= cell[0, :] * round(cell[1, 0] / cell[0, 0])
 
 
 @typeguard.typechecked
@@ -548,46 +699,74 @@ def get_mass_matrix(geometry: Geometry) -> np.ndarray:
     Returns:
         np.ndarray: Mass matrix.
     """
-    masses = np.repeat(
-        np.array([atomic_masses[n] for n in geometry.per_atom.numbers]),
-        3,
-    )
-    sqrt_inv = 1 / np.sqrt(masses)
+    sqrt_inv = _sqrt_inv_masses(geometry.per_atom.numbers.tobytes())
     return np.outer(sqrt_inv, sqrt_inv)
 
 
+@functools.lru_cache(maxsize=64)
+def _sqrt_inv_masses(numbers: bytes) -> np.ndarray:
+    # inverse square root of the mass of each degree of freedom, cached on the
+    # atomic numbers since hessians of the same system are weighted repeatedly
+    masses = np.repeat(atomic_masses[np.frombuffer(numbers, dtype=np.uint8)], 3)
+    sqrt_inv = 1 / np.sqrt(masses)
+    sqrt_inv.flags.writeable = False
+    return sqrt_inv
+
+
 @typeguard.typechecked
-def mass_weight(hessian: np.ndarray, geometry: Geometry) -> np.ndarray:
+def mass_weight(
+    hessian: np.ndarray,
+    geometry: Geometry,
+    inplace: bool = False,
+) -> np.ndarray:
     """
     Apply mass-weighting to a Hessian matrix.
 
     Args:
         hessian (np.ndarray): Input Hessian matrix.
         geometry (Geometry): Geometry associated with the Hessian.
+        inplace (bool): Whether to overwrite the input Hessian instead of copying it.
 
     Returns:
         np.ndarray: Mass-weighted Hessian matrix.
     """
     assert hessian.shape[0] == hessian.shape[1]
     assert len(geometry) * 3 == hessian.shape[0]
-    return hessian * get_mass_matrix(geometry)
+    sqrt_inv = _sqrt_inv_masses(geometry.per_atom.numbers.tobytes())
+    if inplace:
+        hessian *= sqrt_inv[:, None]
+    else:
+        hessian = hessian * sqrt_inv[:, None]
+    hessian *= sqrt_inv[None, :]
+    return hessian
 
 
 @typeguard.typechecked
-def mass_unweight(hessian: np.ndarray, geometry: Geometry) -> np.ndarray:
+def mass_unweight(
+    hessian: np.ndarray,
+    geometry: Geometry,
+    inplace: bool = False,
+) -> np.ndarray:
     """
     Remove mass-weighting from a Hessian matrix.
 
     Args:
         hessian (np.ndarray): Input mass-weighted Hessian matrix.
         geometry (Geometry): Geometry associated with the Hessian.
+        inplace (bool): Whether to overwrite the input Hessian instead of copying it.
 
     Returns:
         np.ndarray: Unweighted Hessian matrix.
     """
     assert hessian.shape[0] == hessian.shape[1]
     assert len(geometry) * 3 == hessian.shape[0]
-    return hessian / get_mass_matrix(geometry)
+    sqrt_inv = _sqrt_inv_masses(geometry.per_atom.numbers.tobytes())
+    if inplace:
+        hessian /= sqrt_inv[:, None]
+    else:
+        hessian = hessian / sqrt_inv[:, None]
+    hessian /= sqrt_inv[None, :]
+    return hessian
 
 
 def create_outputs(quantities: list[str], data: list[Geometry]) -> list[np.ndarray]:
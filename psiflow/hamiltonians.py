@@ -1,6 +1,10 @@
 from __future__ import annotations  # necessary for type-guarding class methods
 
-import urllib
+import hashlib
+import os
+import shutil
+import tempfile
+import urllib.request
 from functools import partial
 from pathlib import Path
 from typing import ClassVar, Optional, Union
@@ -28,6 +32,25 @@ from psiflow.utils.apps import copy_app_future, get_attribute
 from psiflow.utils.io import dump_json
 
 
+@typeguard.typechecked
+def download(url: str, path: Union[str, Path]) -> None:
+    # keep a per-user copy of downloaded files to avoid refetching them
+    name = hashlib.sha1(url.encode()).hexdigest() + "_" + Path(url).name
+    path_cache = Path.home() / ".cache" / "psiflow" / name
+    if not path_cache.is_file():
+        path_cache.parent.mkdir(parents=True, exist_ok=True)
+        # private temporary file, in case other processes fetch the same url
+        fd, path_tmp = tempfile.mkstemp(dir=path_cache.parent, suffix=".tmp")
+        os.close(fd)
+        try:
+            urllib.request.urlretrieve(url, path_tmp)
+            os.replace(path_tmp, path_cache)  # never leave partial downloads in cache
+        finally:
+            if os.path.exists(path_tmp):
+                os.remove(path_tmp)
+    shutil.copyfile(path_cache, path)
+
+
 @typeguard.typechecked
 @psiflow.serializable
 class Hamiltonian(Computable):
@@ -270,6 +293,9 @@ class PlumedHamiltonian(Hamiltonian):
     plumed_input: str
     external: Optional[psiflow._DataFuture]
     function_name: ClassVar[str] = "PlumedFunction"
+    # frames are evaluated without bias updates and hence independent; use
+    # smaller batches to spread large datasets over multiple htex workers
+    batch_size = 100
 
     def __init__(
         self,
@@ -406,6 +432,7 @@ class MACEHamiltonian(Hamiltonian):
             "dtype": "float32",
             "device": "gpu" if evaluation.gpu else "cpu",
             "env_vars": evaluation.env_vars,
+            "torch_compile": evaluation.torch_compile,
         }
 
     def __eq__(self, hamiltonian) -> bool:
@@ -431,18 +458,12 @@ class MACEHamiltonian(Hamiltonian):
         )
         assert size in urls
         parsl_file = psiflow.context().new_file("mace_mp_", ".pth")
-        urllib.request.urlretrieve(
-            urls[size],
-            parsl_file.filepath,
-        )
+        download(urls[size], parsl_file.filepath)
         return cls(parsl_file, {})
 
     @classmethod
     def mace_cc(cls) -> MACEHamiltonian:
         url = "https://github.com/molmod/psiflow/raw/main/examples/data/ani500k_cc_cpu.model"
         parsl_file = psiflow.context().new_file("mace_mp_", ".pth")
-        urllib.request.urlretrieve(
-            url,
-            parsl_file.filepath,
-        )
+        download(url, parsl_file.filepath)
         return cls(parsl_file, {})
@@ -12,7 +12,7 @@ from parsl.dataflow.futures import AppFuture
 import psiflow
 from psiflow.data import Dataset
 from psiflow.geometry import Geometry
-from psiflow.hamiltonians import Hamiltonian
+from psiflow.hamiltonians import Hamiltonian, Zero
 from psiflow.models import Model
 from psiflow.sampling import SimulationOutput
 from psiflow.utils.apps import combine_futures, log_message, setup_logger
@@ -388,14 +388,16 @@ def _update_logs(
     from psiflow.utils.io import _load_metrics, _save_metrics
 
     data0 = _read_frames(inputs=[inputs[1]])
-    data1 = _read_frames(inputs=[inputs[2]])
-
     energy0 = _extract_quantities(("per_atom_energy",), None, None, *data0)[0]
-    energy1 = _extract_quantities(("per_atom_energy",), None, None, *data1)[0]
-    e_rmse = _compute_rmse(energy0, energy1, reduce=False)
-
     forces0 = _extract_quantities(("forces",), None, None, *data0)[0]
-    forces1 = _extract_quantities(("forces",), None, None, *data1)[0]
+    if len(inputs) > 2:
+        data1 = _read_frames(inputs=[inputs[2]])
+        energy1 = _extract_quantities(("per_atom_energy",), None, None, *data1)[0]
+        forces1 = _extract_quantities(("forces",), None, None, *data1)[0]
+    else:  # errors with respect to zero
+        energy1 = np.where(np.isnan(energy0), np.nan, 0.0)
+        forces1 = np.where(np.isnan(forces0), np.nan, 0.0)
+    e_rmse = _compute_rmse(energy0, energy1, reduce=False)
     f_rmse = _compute_rmse(forces0, forces1, reduce=False)
 
     identifiers = _extract_quantities(("identifier",), None, None, *data0)[0]
@@ -516,9 +518,11 @@ class Metrics:
         self.metrics = metrics
 
     def update(self, data: Dataset, hamiltonian: Hamiltonian):
-        data_ = data.evaluate(hamiltonian)
+        inputs = [self.metrics, data.extxyz]
+        if not isinstance(hamiltonian, Zero):  # no need to evaluate zeros
+            inputs.append(data.evaluate(hamiltonian).extxyz)
         metrics = update_logs(
-            inputs=[self.metrics, data.extxyz, data_.extxyz],
+            inputs=inputs,
             outputs=[psiflow.context().new_file("metrics_", ".numpy")],
         ).outputs[0]
         self.metrics = metrics
@@ -10,6 +10,7 @@ import psiflow
 from psiflow.models._mace import MACE, MACEConfig  # noqa: F401
 from psiflow.models.model import Model
 from psiflow.utils.apps import copy_data_future
+from psiflow.utils.io import SafeLoader
 
 
 @typeguard.typechecked
@@ -26,7 +27,7 @@ def load_model(path: Union[Path, str]) -> Model:
         if path_config.is_file():
             break
     with open(path_config, "r") as f:
-        config = yaml.load(f, Loader=yaml.FullLoader)
+        config = yaml.load(f, Loader=SafeLoader)
     atomic_energies = {}
     for key in list(config):
         print(key)
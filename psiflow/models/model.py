@@ -90,6 +90,7 @@ class Model:
     def save(
         self,
         path: Union[Path, str],
+        require_done: bool = False,
     ) -> None:
         path = psiflow.resolve_and_check(Path(path))
         path.mkdir(exist_ok=True)
@@ -101,17 +102,24 @@ class Model:
             "atomic_energies_" + key: value
             for key, value in self.atomic_energies.items()
         }
-        save_yaml(
-            self._config,
-            outputs=[File(str(path_config))],
-            **atomic_energies,
-        )
+        futures = [
+            save_yaml(
+                self._config,
+                outputs=[File(str(path_config))],
+                **atomic_energies,
+            )
+        ]
         if self.model_future is not None:
             path_model = path / "{}.pth".format(name)
-            copy_data_future(
-                inputs=[self.model_future],
-                outputs=[File(str(path_model))],
+            futures.append(
+                copy_data_future(
+                    inputs=[self.model_future],
+                    outputs=[File(str(path_model))],
+                )
             )
+        if require_done:  # writes are independent; .result() raises on failure
+            for future in futures:
+                future.result()
 
     def copy(self) -> Model:
         model = self.__class__(**asdict(self.config))
@@ -2,8 +2,9 @@ from __future__ import annotations  # necessary for type-guarding class methods
 
 import copy
 import io
+import json
 import logging
-from functools import partial
+from functools import lru_cache, partial
 from typing import Optional, Union
 
 import numpy as np
@@ -15,7 +16,7 @@ from cp2k_input_tools.parser import CP2KInputParserSimplified
 from parsl.app.app import bash_app, python_app
 
 import psiflow
-from psiflow.geometry import Geometry, NullState
+from psiflow.geometry import SYMBOLS, Geometry, NullState
 from psiflow.reference.reference import Reference
 
 logger = logging.getLogger(__name__)  # logging per module
@@ -28,6 +29,17 @@ def check_input(cp2k_input_str: str):
 
 @typeguard.typechecked
 def str_to_dict(cp2k_input_str: str) -> dict:
+    # callers modify the parsed dict in place, so never hand out the cached one
+    return copy.deepcopy(_parse_input(cp2k_input_str))
+
+
+@typeguard.typechecked
+def dict_to_str(cp2k_input_dict: dict) -> str:
+    return _generate_input(cp2k_input_dict)
+
+
+@lru_cache(maxsize=64)
+def _parse_input(cp2k_input_str: str) -> dict:
     return CP2KInputParserSimplified(
         repeated_section_unpack=True,
         # multi_value_unpack=False,
@@ -35,24 +47,28 @@ def str_to_dict(cp2k_input_str: str) -> dict:
     ).parse(io.StringIO(cp2k_input_str))
 
 
-@typeguard.typechecked
-def dict_to_str(cp2k_input_dict: dict) -> str:
-    return "\n".join(list(CP2KInputGenerator().line_iter(cp2k_input_dict)))
+@lru_cache(maxsize=None)
+def _input_generator() -> CP2KInputGenerator:
+    # constructing a generator parses the full CP2K input specification (XML),
+    # which takes much longer than generating an input file; it is read-only
+    # afterwards, so one instance is shared by all calls
+    return CP2KInputGenerator()
+
+
+def _generate_input(cp2k_input_dict: dict) -> str:
+    return "\n".join(list(_input_generator().line_iter(cp2k_input_dict)))
 
 
 @typeguard.typechecked
 def insert_atoms_in_input(cp2k_input_dict: dict, geometry: Geometry):
-    from ase.data import chemical_symbols
-
     # get rid of topology if it's there
     cp2k_input_dict["force_eval"]["subsys"].pop("topology", None)
 
-    coord = []
     cell = {}
-    numbers = geometry.per_atom.numbers
-    positions = geometry.per_atom.positions
-    for i in range(len(geometry)):
-        coord.append("{} {} {} {}".format(chemical_symbols[numbers[i]], *positions[i]))
+    # format plain Python objects rather than numpy scalars
+    symbols = SYMBOLS[geometry.per_atom.numbers].tolist()
+    x, y, z = geometry.per_atom.positions.T.tolist()
+    coord = ["%s %s %s %s" % row for row in zip(symbols, x, y, z)]
     cp2k_input_dict["force_eval"]["subsys"]["coord"] = {"*": coord}
 
     assert geometry.periodic  # CP2K needs cell info!
@@ -85,56 +101,74 @@ def set_global_section(cp2k_input_dict: dict, properties: tuple):
         global_dict["fm"] = {"type_of_matrix_multiplication": "SCALAPACK"}
 
 
+COORDINATES_HEADER = "MODULE QUICKSTEP: ATOMIC COORDINATES IN ANGSTROM"
+ENERGY_HEADER = "ENERGY| Total FORCE_EVAL ( QS ) energy [a.u.]"
+FORCES_HEADER = "ATOMIC FORCES in [a.u.]"
+
+
+def _find_last_line(output: str, header: str) -> Optional[int]:
+    # start of the last line which begins with header, up to leading whitespace
+    position = output.rfind(header)
+    while position != -1:
+        start = output.rfind("\n", 0, position) + 1
+        if not output[start:position].strip():
+            return start
+        position = output.rfind(header, 0, position)
+    return None
+
+
+def _split_block(output: str, start: int, skip: int, nlines: int) -> list[str]:
+    # lines [skip, skip + nlines) counted from the line which begins at start
+    end = start
+    for _ in range(skip + nlines):
+        end = output.find("\n", end) + 1
+        if end == 0:  # output ends within the block
+            end = len(output)
+            break
+    return output[start:end].split("\n")[skip : skip + nlines]
+
+
 def parse_cp2k_output(
     cp2k_output_str: str, properties: tuple, geometry: Geometry
 ) -> Geometry:
     natoms = len(geometry)
-    all_lines = cp2k_output_str.split("\n")
+
+    # search backwards for the last occurrence of each block; only the lines of
+    # those blocks are split off instead of the entire output. Failed runs
+    # have no energy line, so they are discarded before anything is parsed
+    energy_start = _find_last_line(cp2k_output_str, ENERGY_HEADER)
+    if energy_start is None:
+        return NullState
 
     # read coordinates
-    lines = None
-    for i, line in enumerate(all_lines):
-        if line.strip().startswith("MODULE QUICKSTEP: ATOMIC COORDINATES IN ANGSTROM"):
-            skip = 3
-            lines = all_lines[i + skip : i + skip + natoms]
-    if lines is None:
+    coordinates_start = _find_last_line(cp2k_output_str, COORDINATES_HEADER)
+    if coordinates_start is None:
         return NullState
+    skip = 3
+    lines = _split_block(cp2k_output_str, coordinates_start, skip, natoms)
     assert len(lines) == natoms
-    positions = np.zeros((natoms, 3))
-    for j, line in enumerate(lines):
-        try:
-            positions[j, :] = np.array([float(f) for f in line.split()[4:7]])
-        except ValueError:  # if positions exploded, CP2K puts *** instead of float
-            return NullState
+    try:
+        positions = np.loadtxt(lines, usecols=(4, 5, 6), ndmin=2)
+    except ValueError:  # if positions exploded, CP2K puts *** instead of float
+        return NullState
     assert np.allclose(
         geometry.per_atom.positions, positions, atol=1e-2
     )  # accurate up to 0.01 A
 
-    # try and read energy
-    energy = None
-    for line in all_lines:
-        if line.strip().startswith("ENERGY| Total FORCE_EVAL ( QS ) energy [a.u.]"):
-            energy = float(line.split()[-1]) * Ha
-    if energy is None:
-        return NullState
-    geometry.energy = energy
+    # read energy
+    energy_line = _split_block(cp2k_output_str, energy_start, 0, 1)[0]
+    geometry.energy = float(energy_line.split()[-1]) * Ha
     geometry.per_atom.forces[:] = np.nan
 
     # try and read forces if requested
     if "forces" in properties:
-        lines = None
-        for i, line in enumerate(all_lines):
-            if line.strip().startswith("ATOMIC FORCES in [a.u.]"):
-                skip = 3
-                lines = all_lines[i + skip : i + skip + natoms]
-        if lines is None:
+        forces_start = _find_last_line(cp2k_output_str, FORCES_HEADER)
+        if forces_start is None:
             return NullState
+        lines = _split_block(cp2k_output_str, forces_start, skip, natoms)
         assert len(lines) == natoms
-        forces = np.zeros((natoms, 3))
-        for j, line in enumerate(lines):
-            forces[j, :] = np.array([float(f) for f in line.split()[3:6]])
-        forces *= Ha / Bohr
-        geometry.per_atom.forces[:] = forces
+        forces = np.loadtxt(lines, usecols=(3, 4, 5), ndmin=2)
+        np.multiply(forces, Ha / Bohr, out=geometry.per_atom.forces)
     geometry.stress = None
     return geometry
 
@@ -146,16 +180,25 @@ def _prepare_input(
     outputs: list = [],
 ):
     from psiflow.reference._cp2k import (
-        dict_to_str,
+        _generate_input,
         insert_atoms_in_input,
         set_global_section,
     )
 
+    # the template is shared between all evaluations; copy only the sections
+    # which are modified below instead of the entire (parsed) input
+    cp2k_input_dict = dict(cp2k_input_dict)
+    cp2k_input_dict["global"] = dict(cp2k_input_dict.get("global", {}))
+    cp2k_input_dict["force_eval"] = dict(cp2k_input_dict["force_eval"])
+    cp2k_input_dict["force_eval"]["subsys"] = dict(
+        cp2k_input_dict["force_eval"]["subsys"]
+    )
+
     set_global_section(cp2k_input_dict, properties)
     insert_atoms_in_input(cp2k_input_dict, geometry)
     if "forces" in properties:
         cp2k_input_dict["force_eval"]["print"] = {"FORCES": {}}
-    cp2k_input_str = dict_to_str(cp2k_input_dict)
+    cp2k_input_str = _generate_input(cp2k_input_dict)  # unique per geometry
     with open(outputs[0], "w") as f:
         f.write(cp2k_input_str)
 
@@ -173,9 +216,10 @@ def cp2k_singlepoint_pre(
 ):
     tmp_command = 'mytmpdir=$(mktemp -d 2>/dev/null || mktemp -d -t "mytmpdir")'
     cd_command = "cd $mytmpdir"
-    cp_command = "cp {} cp2k.inp".format(inputs[0].filepath)
+    # CP2K only reads its input, so a link avoids copying it into the tmpdir
+    ln_command = "ln -s {} cp2k.inp".format(inputs[0].filepath)
 
-    command_list = [tmp_command, cd_command, cp_command, cp2k_command]
+    command_list = [tmp_command, cd_command, ln_command, cp2k_command]
 
     return " && ".join(command_list)
 
@@ -256,12 +300,13 @@ class CP2K(Reference):
     def get_single_atom_references(self, element):
         number = atomic_numbers[element]
         references = []
+        template = json.dumps(self.cp2k_input_dict)  # cheaper to copy than deepcopy
         for mult in range(1, 16):
             if number % 2 == 0 and mult % 2 == 0:
                 continue  # not 2N + 1 is never even
             if mult - 1 > number:
                 continue  # max S = 2 * (N * 1/2) + 1
-            cp2k_input_dict = copy.deepcopy(self.cp2k_input_dict)
+            cp2k_input_dict = json.loads(template)
             cp2k_input_dict["force_eval"]["dft"]["uks"] = "TRUE"
             cp2k_input_dict["force_eval"]["dft"]["multiplicity"] = mult
             cp2k_input_dict["force_eval"]["dft"]["charge"] = 0
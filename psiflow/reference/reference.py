@@ -13,7 +13,7 @@ from parsl.dataflow.futures import AppFuture
 import psiflow
 from psiflow.data import Computable, Dataset
 from psiflow.geometry import Geometry, NullState
-from psiflow.utils.apps import copy_app_future, unpack_i
+from psiflow.utils.apps import copy_app_future
 
 logger = logging.getLogger(__name__)  # logging per module
 
@@ -64,6 +64,10 @@ def evaluate(
     geometry: Geometry,
     reference: Reference,
 ) -> AppFuture:
+    return _evaluate(geometry, reference)
+
+
+def _evaluate(geometry: Geometry, reference: Reference) -> AppFuture:
     if geometry == NullState:
         return copy_app_future(NullState)
     else:
@@ -82,14 +86,14 @@ def evaluate(
 @join_app
 @typeguard.typechecked
 def compute_dataset(
-    dataset: Dataset,
-    length: int,
+    geometries: list[Geometry],
     reference: Reference,
 ) -> AppFuture:
     from psiflow.data.utils import extract_quantities
 
-    geometries = dataset.geometries()  # read it once
-    evaluated = [evaluate(unpack_i(geometries, i), reference) for i in range(length)]
+    # geometries are available here, so submit the reference apps directly
+    # instead of through an unpack and a join app per geometry
+    evaluated = [_evaluate(geometry, reference) for geometry in geometries]
     future = extract_quantities(
         tuple(reference.outputs),
         None,
@@ -116,7 +120,7 @@ class Reference(Computable):
             dataset = Dataset(arg)
         elif isinstance(arg, AppFuture) or isinstance(arg, Geometry):
             dataset = Dataset([arg])
-        compute_outputs = compute_dataset(dataset, dataset.length(), self)
+        compute_outputs = compute_dataset(dataset.geometries(), self)
         if len(outputs) == 0:
             outputs_ = tuple(self.outputs)
         else:
@@ -1,4 +1,3 @@
-import copy
 import re
 from pathlib import Path
 from typing import Optional, Union
@@ -76,36 +75,28 @@ def read_output(filename):  # from i-PI
                 "description": description,
             }
 
-    # Parse data
+    # Parse data; convert all rows at once and slice columns per property
+    if len(data_lines) > 0:
+        data = np.array(" ".join(data_lines).split(), dtype=np.float64)
+        data = data.reshape(len(data_lines), -1)
+    else:
+        data = None
+
     values_dict = {}
     info_dict = {}
-    for prop_info in properties.values():
-        # Initialize list to hold values for each property
-        values_dict[prop_info["name"]] = []
+    for column_info, prop_info in properties.items():
+        if "-" in column_info:  # Multi-column property
+            start_col, end_col = map(int, column_info.split("-"))  # 1-based indexing
+        else:  # Single column property
+            start_col = end_col = int(column_info)
+        if data is not None:
+            values = data[:, start_col - 1 : end_col]  # Adjust to 0-based indexing
+            values_dict[prop_info["name"]] = values.squeeze()  # flatten 1-col
+        else:
+            values_dict[prop_info["name"]] = np.array([])
         # Save units and description
         info_dict[prop_info["name"]] = (prop_info["units"], prop_info["description"])
 
-    for line in data_lines:
-        values = line.split()
-        for column_info, prop_info in properties.items():
-            if "-" in column_info:  # Multi-column property
-                start_col, end_col = map(
-                    int, column_info.split("-")
-                )  # 1-based indexing
-                prop_values = values[
-                    start_col - 1 : end_col
-                ]  # Adjust to 0-based indexing
-            else:  # Single column property
-                col_index = int(column_info) - 1  # Adjust to 0-based indexing
-                prop_values = [values[col_index]]
-
-            values_dict[prop_info["name"]].append([float(val) for val in prop_values])
-
-    for prop_name, prop_values in values_dict.items():
-        values_dict[prop_name] = np.array(
-            prop_values
-        ).squeeze()  # make 1-col into a flat array
-
     return values_dict, info_dict
 
 
@@ -184,7 +175,7 @@ def _update_walker(
     if (status in [0, 1]) and state != NullState:
         return state
     else:
-        return copy.deepcopy(start)
+        return start.copy()
 
 
 update_walker = python_app(_update_walker, executors=["default_threads"])
@@ -40,11 +40,10 @@ def template(
         count = counts.get(h.__class__.__name__)
         counts[h.__class__.__name__] += 1
         names.append(h.__class__.__name__ + str(count))
-    _, hamiltonians = zip(*sorted(zip(names, total_hamiltonian.hamiltonians)))
-    _, coefficients = zip(*sorted(zip(names, total_hamiltonian.coefficients)))
-    hamiltonians = list(hamiltonians)
-    coefficients = list(coefficients)
-    names = sorted(names)
+    order = sorted(range(len(names)), key=names.__getitem__)  # names are unique
+    hamiltonians = [total_hamiltonian.hamiltonians[i] for i in order]
+    coefficients = [total_hamiltonian.coefficients[i] for i in order]
+    names = [names[i] for i in order]
     assert MixtureHamiltonian(hamiltonians, coefficients) == total_hamiltonian
     total_hamiltonian = MixtureHamiltonian(hamiltonians, coefficients)
 
@@ -68,7 +67,7 @@ def template(
         weights_table.append(ensemble + tuple(coefficients))
 
     # inspect metadynamics attributes and allocate additional weights per MTD
-    walker_indices = []
+    metad_columns = {}  # walker index -> index of its METAD column
     metad_objects = []
     for i, walker in enumerate(walkers):
         mtd = walker.metadynamics
@@ -79,7 +78,7 @@ def template(
                 "multiple walker metadynamics, use "
                 "psiflow.sampling.multiple_walker_metadynamics"
             )
-            walker_indices.append(i)
+            metad_columns[i] = len(metad_objects)
             metad_objects.append(mtd)
     plumed_list = [mtd.input() for mtd in metad_objects]
 
@@ -88,11 +87,8 @@ def template(
             to_append = ["METAD{}".format(i) for i in range(len(metad_objects))]
         else:
             to_append = [0] * len(metad_objects)
-            try:
-                index = walker_indices.index(i - 1)
-                to_append[index] = 1
-            except ValueError:
-                pass
+            if (i - 1) in metad_columns:
+                to_append[metad_columns[i - 1]] = 1
         weights_table[i] = row + tuple(to_append)
 
     hamiltonians_map = {n: h for n, h in zip(names, hamiltonians)}
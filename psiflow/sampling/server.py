@@ -1,5 +1,4 @@
 import argparse
-import ast
 import glob
 import os
 import signal
@@ -251,29 +250,16 @@ def parse_checkpoint(
             natoms = int(beads.attrib["natoms"])
             nbeads = int(beads.attrib["nbeads"])
 
-            text = "".join(list(beads.iter(tag="q"))[0].text.split())
-            positions = np.array(ast.literal_eval(text))
+            text = list(beads.iter(tag="q"))[0].text
+            positions = np.array(_split_list(text), dtype=float)
             positions = positions.reshape(nbeads, natoms, 3) * Bohr
 
-            text = "".join(list(beads.iter(tag="names"))[0].text.split())
-            text = text.replace(
-                ",",
-                '","',
-            )
-            text = text.replace(
-                "[",
-                '["',
-            )
-            text = text.replace(
-                "]",
-                '"]',
-            )
-            symbols = ast.literal_eval(text)
+            symbols = _split_list(list(beads.iter(tag="names"))[0].text)
             numbers = [atomic_numbers[s] for s in symbols]
 
-            text = "".join(list(system.iter(tag="cell"))[0].text.split())
+            text = list(system.iter(tag="cell"))[0].text
             box = (
-                np.array(ast.literal_eval(text)).reshape(3, 3).T * Bohr
+                np.array(_split_list(text), dtype=float).reshape(3, 3).T * Bohr
             )  # transpose for convention
 
             # get current internal system time
@@ -297,6 +283,12 @@ def parse_checkpoint(
     return states
 
 
+def _split_list(text: str) -> list[str]:
+    # i-PI writes arrays as flat '[ a, b, ... ]' lists; splitting them is much
+    # faster than evaluating them as python literals
+    return "".join(text.split())[1:-1].split(",")
+
+
 def insert_addresses(input_xml):
     for child in input_xml:
         if child.tag == "ffsocket":
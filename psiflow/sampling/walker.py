@@ -30,10 +30,8 @@ def _conditioned_reset(
     state: Geometry,
     start: Geometry,
 ) -> Geometry:
-    from copy import deepcopy  # copy necessary!
-
     if condition:
-        return deepcopy(start)
+        return start.copy()  # copy necessary!
     else:
         return state
 
@@ -135,16 +133,15 @@ class Walker:
 @typeguard.typechecked
 def partition(walkers: list[Walker]) -> list[list[int]]:
     indices = []
+    groups = {}  # coupled walkers are grouped by (hashable) coupling
     for i, walker in enumerate(walkers):
-        found = False
-        if walker.coupling is not None:
-            for group in indices:
-                if walker.coupling == walkers[group[0]].coupling:
-                    assert not found
-                    group.append(i)
-                    found = True
-        if not found:
+        if walker.coupling is None:
             indices.append([i])
+        elif walker.coupling in groups:
+            groups[walker.coupling].append(i)
+        else:
+            groups[walker.coupling] = [i]
+            indices.append(groups[walker.coupling])
     return indices
 
 
@@ -160,11 +157,9 @@ def _get_minimum_energy_states(
 
     energies = numpy.array(energies)
 
-    indices = []
-    for c in coefficients:
-        energy = numpy.sum(c.reshape(-1, 1) * energies, axis=0)
-        indices.append(int(numpy.argmin(energy)))
-    return indices
+    # total energy of each state for every walker's combination of hamiltonians
+    energy = coefficients @ energies
+    return [int(i) for i in numpy.argmin(energy, axis=1)]
 
 
 get_minimum_energy_states = python_app(
@@ -178,12 +173,12 @@ def quench(walkers: list[Walker], dataset: Dataset) -> None:
     all_hamiltonians = sum([w.hamiltonian for w in walkers], start=Zero())
     energies = [h.compute(dataset, "energy") for h in all_hamiltonians.hamiltonians]
 
-    coefficients = []
-    for walker in walkers:
+    shape = (len(walkers), len(all_hamiltonians.hamiltonians))
+    coefficients = np.zeros(shape)
+    for i, walker in enumerate(walkers):
         c = all_hamiltonians.get_coefficients(1.0 * walker.hamiltonian)
         assert c is not None
-        coefficients.append(c)
-    coefficients = np.array(coefficients)
+        coefficients[i, :] = c
 
     indices = get_minimum_energy_states(
         coefficients,
@@ -257,6 +252,11 @@ class ReplicaExchange(Coupling):
         swapfile = self.swapfile.filepath == other.swapfile.filepath
         return trial and rescale and swapfile
 
+    def __hash__(self) -> int:  # consistent with __eq__
+        return hash(
+            (self.trial_frequency, self.rescale_kinetic, self.swapfile.filepath)
+        )
+
     def inputs(self) -> list[Union[DataFuture, File]]:
         return [self.swapfile]
 
@@ -1,8 +1,12 @@
+import functools
 import logging
 import os
+import re
 
 import typeguard
 
+FILE_REGEX = re.compile(r"FILE=\S*")
+
 
 @typeguard.typechecked
 def try_manual_plumed_linking() -> str:
@@ -23,6 +27,7 @@ def try_manual_plumed_linking() -> str:
     return os.environ["PLUMED_KERNEL"]
 
 
+@functools.lru_cache(maxsize=64)  # pure function of input; often called repeatedly
 @typeguard.typechecked
 def remove_comments_printflush(plumed_input: str) -> str:
     new_input = []
@@ -40,15 +45,13 @@ def remove_comments_printflush(plumed_input: str) -> str:
 
 @typeguard.typechecked
 def set_path_in_plumed(plumed_input: str, keyword: str, path_to_set: str) -> str:
+    new_file = "FILE={}".format(path_to_set)
     lines = plumed_input.split("\n")
     for i, line in enumerate(lines):
-        if keyword in line:
-            if "FILE=" not in line:
-                lines[i] = line + " FILE={}".format(path_to_set)
-                continue
-            line_before = line.split("FILE=")[0]
-            line_after = line.split("FILE=")[1].split()[1:]
-            lines[i] = (
-                line_before + "FILE={} ".format(path_to_set) + " ".join(line_after)
-            )
+        if keyword not in line:
+            continue
+        line, nsubs = FILE_REGEX.subn(lambda _: new_file, line, count=1)
+        if nsubs == 0:
+            line += " " + new_file
+        lines[i] = line
     return "\n".join(lines)
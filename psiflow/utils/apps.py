@@ -1,7 +1,10 @@
 from __future__ import annotations  # necessary for type-guarding class methods
 
+import copy
 import logging
+import shutil
 import sys
+from pathlib import Path
 from typing import Any, Union
 
 import numpy as np
@@ -36,6 +39,8 @@ multiply = python_app(_multiply, executors=["default_threads"])
 def setup_logger(module_name):
     # Create logger instance for the module
     module_logger = logging.getLogger(module_name)
+    if module_logger.handlers:  # already set up; avoid duplicate log lines
+        return module_logger
 
     # Set the desired format string
     formatter = logging.Formatter("%(name)s - %(message)s")
@@ -62,7 +67,7 @@ compute_sum = python_app(_compute_sum, executors=["default_threads"])
 
 @typeguard.typechecked
 def _combine_futures(inputs: list[Any]) -> list[Any]:
-    return list(inputs)
+    return inputs  # parsl passes a new list with the resolved futures
 
 
 combine_futures = python_app(_combine_futures, executors=["default_threads"])
@@ -74,9 +79,6 @@ def _copy_data_future(
     inputs: list[File] = [],
     outputs: list[File] = [],
 ) -> None:
-    import shutil
-    from pathlib import Path
-
     assert len(inputs) == 1
     assert len(outputs) == 1
     if Path(outputs[0]).is_file() and pass_on_exist:
@@ -93,9 +95,7 @@ copy_data_future = python_app(_copy_data_future, executors=["default_threads"])
 @typeguard.typechecked
 def _copy_app_future(future: Any, inputs: list = [], outputs: list = []) -> Any:
     # inputs/outputs to enforce additional dependencies
-    from copy import deepcopy
-
-    return deepcopy(future)
+    return copy.deepcopy(future)
 
 
 copy_app_future = python_app(_copy_app_future, executors=["default_threads"])
@@ -1,11 +1,22 @@
+import copy
+import functools
+import json
+import os
 import xml.etree.ElementTree as ET
 from typing import Any
 
 import numpy as np
 import typeguard
+import yaml
 from parsl.app.app import python_app
 from parsl.data_provider.files import File
 
+try:  # use libyaml bindings when available
+    from yaml import CSafeDumper as SafeDumper
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeDumper, SafeLoader  # noqa: F401
+
 
 @typeguard.typechecked
 def _save_yaml(
@@ -13,26 +24,24 @@ def _save_yaml(
     outputs: list[File] = [],
     **extra_keys: Any,
 ) -> None:
-    import yaml
-
-    def _make_dict_safe(arg):
-        # walks through dict and converts numpy types to python natives
-        for key in list(arg.keys()):
-            if hasattr(arg[key], "item"):
-                arg[key] = arg[key].item()
-            elif type(arg[key]) is dict:
-                arg[key] = _make_dict_safe(arg[key])
-            else:
-                pass
-        return arg
+    def _make_safe(value):
+        # converts numpy types to python natives, also inside (nested) containers
+        if isinstance(value, (np.generic, np.ndarray)):
+            return value.tolist()
+        elif isinstance(value, dict):
+            return {key: _make_safe(v) for key, v in value.items()}
+        elif isinstance(value, (list, tuple)):
+            return [_make_safe(v) for v in value]
+        else:
+            return value
 
     input_dict = dict(input_dict)
     for key, value in extra_keys.items():
         assert key not in input_dict
         input_dict[key] = value
-    input_dict = _make_dict_safe(input_dict)
+    input_dict = _make_safe(input_dict)
     with open(outputs[0], "w") as f:
-        yaml.dump(input_dict, f, default_flow_style=False)
+        yaml.dump(input_dict, f, Dumper=SafeDumper, default_flow_style=False)
 
 
 save_yaml = python_app(_save_yaml, executors=["default_threads"])
@@ -61,11 +70,17 @@ load_numpy = python_app(_load_numpy, executors=["default_threads"])
 
 @typeguard.typechecked
 def _read_yaml(inputs: list[File] = [], outputs: list[File] = []) -> dict:
-    import yaml
+    # parsed contents are cached per process; a modified file has a different
+    # key, and callers get their own copy of the cached dict
+    stat = os.stat(inputs[0])
+    config_dict = _load_yaml(str(inputs[0]), stat.st_mtime_ns, stat.st_size)
+    return copy.deepcopy(config_dict)
+
 
-    with open(inputs[0], "r") as f:
-        config_dict = yaml.load(f, Loader=yaml.FullLoader)
-    return config_dict
+@functools.lru_cache(maxsize=64)
+def _load_yaml(path: str, mtime_ns: int, size: int) -> dict:
+    with open(path, "r") as f:
+        return yaml.load(f, Loader=SafeLoader)
 
 
 read_yaml = python_app(_read_yaml, executors=["default_threads"])
@@ -103,10 +118,6 @@ def _dump_json(
     outputs: list = [],
     **kwargs,
 ) -> None:
-    import json
-
-    import numpy as np
-
     def convert_to_list(array):
         if not type(array) is np.ndarray:
             if type(array) is np.floating:
@@ -0,0 +1,3 @@
+
+export JOBNAME=parsl.default_htex.block-0.1792069661.9257927
+process_worker_pool.py  --max_workers_per_node=4 -a 127.0.0.1 -p 0 -c 1 -m None --poll 10 --task_port=54376 --result_port=54770 --cert_dir None --logdir=/root/package/psiflow_internal/000/default_htex --block_id=0 --hb_period=30  --hb_threshold=120 --drain_period=None --cpu-affinity none  --mpi-launcher=mpiexec --available-accelerators 
\ No newline at end of file
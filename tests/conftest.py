@@ -39,7 +39,7 @@ def gpu(request):
 @pytest.fixture(scope="session", autouse=True)
 def context(request, tmp_path_factory):
     try:
-        context = psiflow.context()
+        context = psiflow.context()  # noqa: F841
     except RuntimeError:
         path_config = Path(request.config.getoption("--psiflow-config"))
         with open(path_config, "r") as f:
@@ -49,6 +49,8 @@ def context(request, tmp_path_factory):
         context = psiflow.context()  # noqa: F841
         yield
         parsl.dfk().cleanup()
+    else:  # reuse the existing context; its owner is responsible for cleanup
+        yield
 
 
 @pytest.fixture(scope="session")
@@ -11,6 +11,7 @@ from parsl.data_provider.files import File
 import psiflow
 from psiflow.data import Dataset, compute_rmse
 from psiflow.data.utils import (
+    _not_null,
     _read_frames,
     _write_frames,
     get_index_element_mask,
@@ -149,6 +150,15 @@ def test_readwrite_cycle(dataset, tmp_path):
     states = _read_frames(inputs=[str(tmp_path / "test.xyz")])
     assert "test" in states[2].order
 
+    with open(tmp_path / "test.xyz", "r") as f:
+        lines = f.readlines()
+    with open(tmp_path / "truncated.xyz", "w") as f:
+        f.writelines(lines[:-1])  # drop last atom line
+    with pytest.raises(AssertionError, match="truncated frame"):
+        _read_frames(inputs=[str(tmp_path / "truncated.xyz")])
+    with pytest.raises(AssertionError, match="truncated frame"):
+        _not_null(inputs=[str(tmp_path / "truncated.xyz")])
+
     s = """3
 energy=3.0 phase=c7eq Properties=species:S:1:pos:R:3:momenta:R:3:forces:R:3
 C 0 1 2 3 4 5 6 7 8
@@ -169,6 +179,10 @@ F 2 3 4 5 6 7 8 9 10
         geometry.per_atom.forces,
         np.array([[6,7,8], [7,8,9], [8,9,10]]),
     )
+    s = s.replace("phase=c7eq", 'phase="c7 eq" tags={1 2}')  # ASE fallback
+    geometry = Geometry.from_string(s, natoms=None)
+    assert geometry.energy == 3.0
+    assert geometry.phase == "c7 eq"
     s = """7
 
 O       0.269073490000000      0.952731530000000      0.639899630000000
@@ -188,6 +202,13 @@ H      -0.764765500000000     -0.536376480000000     -1.844856190000000
     geometry.stress = np.array([np.nan] * 9).reshape(3, 3)
     assert "nan" not in geometry.to_string()
 
+    empty = Geometry.from_data(np.zeros(0), np.zeros((0, 3)), cell=None)
+    assert len(empty.to_string().split("\n")) == 2  # no empty atom block
+    assert len(Geometry.from_string(empty.to_string())) == 0
+    _write_frames(empty, data[0], empty, outputs=[str(tmp_path / "empty.xyz")])
+    states = _read_frames(inputs=[str(tmp_path / "empty.xyz")])
+    assert [len(state) for state in states] == [0, len(data[0]), 0]
+
 
 def test_dataset_empty(tmp_path):
     dataset = Dataset([])
@@ -254,6 +275,8 @@ def test_dataset_slice(dataset):
     assert subset.length().result() == 10
     for i, geometry in enumerate(subset.geometries().result()):
         assert geometry == dataset[i].result()
+    for i, geometry in enumerate(dataset.geometries(slice(0, 10)).result()):
+        assert geometry == dataset[i].result()
 
 
 def test_dataset_from_xyz(tmp_path, dataset):
@@ -333,14 +333,12 @@ def test_evaluate(dataset):
         hamiltonian,
         batch_size=2,
     )
-    energy = hamiltonian.compute(evaluated, "energy")
+    energy = hamiltonian.compute(evaluated, "energy").result()
+    energy_ = evaluated_.get("energy").result()
     for i, geometry in enumerate(evaluated.geometries().result()):
         assert not np.all(np.isnan(geometry.per_atom.forces))
-        assert np.allclose(geometry.energy, energy.result()[i])
-        assert np.allclose(
-            evaluated_[i].result().energy,
-            geometry.energy,
-        )
+        assert np.allclose(geometry.energy, energy[i])
+        assert np.allclose(energy_[i], geometry.energy)
 
 
 def test_json_dump():
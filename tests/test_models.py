@@ -1,6 +1,7 @@
 import copy
 
 import numpy as np
+import pytest
 from parsl.app.futures import DataFuture
 
 import psiflow
@@ -41,8 +42,6 @@ def test_mace_init(mace_config, dataset):
     assert hamiltonian == model.create_hamiltonian()
     energies = hamiltonian.compute(dataset, "energy").result()
 
-    nstates = dataset.length().result()
-    # energies = np.array([evaluated[i].result().energy for i in range(nstates)])
     assert not np.any(np.allclose(energies, 0.0))
     energy_Cu = 3
     energy_H = 7
@@ -57,11 +56,8 @@ def test_mace_init(mace_config, dataset):
     assert hamiltonian != model.create_hamiltonian()  # atomic energies
 
     evaluated = dataset.evaluate(hamiltonian)
-    for i in range(nstates):
-        assert np.allclose(
-            energies[i],
-            evaluated.subtract_offset(Cu=energy_Cu, H=energy_H)[i].result().energy,
-        )
+    energies_ = evaluated.subtract_offset(Cu=energy_Cu, H=energy_H).get("energy")
+    assert np.allclose(energies, energies_.result())
 
     energies = hamiltonian.compute(dataset, "energy").result()
     second = psiflow.deserialize(psiflow.serialize(hamiltonian).result())
@@ -80,8 +76,10 @@ def test_mace_train(gpu, mace_config, dataset, tmp_path):
     # it with the manually computed value
     training = dataset[:-5]
     validation = dataset[-5:]
-    mace_config["start_swa"] = 100
-    model = MACE(**mace_config)
+    config = copy.deepcopy(mace_config)  # session-scoped fixture
+    config["start_swa"] = 100
+    config["max_num_epochs"] = 200  # plenty to reduce the rmse; default is 2048
+    model = MACE(**config)
     model.initialize(training)
     hamiltonian0 = model.create_hamiltonian()
     rmse0 = compute_rmse(
@@ -119,6 +117,14 @@ def test_mace_save_load(mace_config, dataset, tmp_path):
     e1 = model_.create_hamiltonian().compute(dataset[3], "energy").result()
     assert np.allclose(e0, e1, atol=1e-4)  # up to single precision
 
+    model.save(tmp_path / "done", require_done=True)  # no psiflow.wait() needed
+    assert (tmp_path / "done" / "MACE.yaml").exists()
+    assert (tmp_path / "done" / "MACE.pth").exists()
+
+    (tmp_path / "failed" / "MACE.pth").mkdir(parents=True)
+    with pytest.raises(IsADirectoryError):  # failed copy is not swallowed
+        model.save(tmp_path / "failed", require_done=True)
+
 
 def test_mace_seed(mace_config):
     model = MACE(**mace_config)
@@ -32,23 +32,24 @@ CV: DISTANCE ATOMS=1,2 NOPBC
 RESTRAINT ARG=CV AT=1 KAPPA=1
 """
     plumed = PlumedHamiltonian(plumed_str)
-    einstein = EinsteinCrystal(dataset[0], force_constant=0.1)
-    einstein_ = EinsteinCrystal(dataset[0], force_constant=0.2)
-    walker = Walker(dataset[0], einstein, temperature=300, metadynamics=mtd0)
+    start = dataset[0]  # one future shared by all walkers and hamiltonians
+    einstein = EinsteinCrystal(start, force_constant=0.1)
+    einstein_ = EinsteinCrystal(start, force_constant=0.2)
+    walker = Walker(start, einstein, temperature=300, metadynamics=mtd0)
     assert walker.nvt
     assert not walker.npt
     assert not walker.pimd
 
     walkers = [walker]
-    walkers.append(Walker(dataset[0], 0.5 * einstein_, nbeads=4, metadynamics=mtd1))
-    walkers.append(Walker(dataset[0], einstein + plumed, nbeads=4))
+    walkers.append(Walker(start, 0.5 * einstein_, nbeads=4, metadynamics=mtd1))
+    walkers.append(Walker(start, einstein + plumed, nbeads=4))
     walkers.append(
-        Walker(dataset[0], einstein, pressure=0, temperature=300, metadynamics=mtd1)
+        Walker(start, einstein, pressure=0, temperature=300, metadynamics=mtd1)
     )
     walkers.append(
-        Walker(dataset[0], einstein_, pressure=100, temperature=600, metadynamics=mtd1)
+        Walker(start, einstein_, pressure=100, temperature=600, metadynamics=mtd1)
     )
-    walkers.append(Walker(dataset[0], einstein, temperature=600, metadynamics=mtd1))
+    walkers.append(Walker(start, einstein, temperature=600, metadynamics=mtd1))
 
     # nvt
     _walkers = [walkers[0], walkers[-1]]
@@ -176,19 +177,14 @@ METAD ARG=CV PACE=5 SIGMA=0.05 HEIGHT=5
         assert nhills > 3
 
     assert len(simulation_outputs) == 2
-    energies = [
-        simulation_outputs[0]["potential{electronvolt}"].result(),
-        simulation_outputs[1]["potential{electronvolt}"].result(),
-    ]
-    energies_ = [
-        (0.9 * plumed + einstein).compute(simulation_outputs[0].trajectory, "energy"),
-        einstein.compute(simulation_outputs[1].trajectory, "energy"),
-    ]
-    assert len(energies[0]) == len(energies_[0].result())
-    assert np.allclose(
-        energies[0],
-        energies_[0].result(),
+    energies = simulation_outputs[0]["potential{electronvolt}"].result()
+    energies_ = (
+        (0.9 * plumed + einstein)
+        .compute(simulation_outputs[0].trajectory, "energy")
+        .result()
     )
+    assert len(energies) == len(energies_)
+    assert np.allclose(energies, energies_)
     time = simulation_outputs[0]["time{picosecond}"].result()
     assert np.allclose(
         time,